@@ -0,0 +1,81 @@
+'''
+    Shared setup of the benchmarks, run against a server started with mongoURI pointing at a local mongod
+'''
+import datetime
+import statistics
+import uuid
+
+def auth_headers( signin ):
+    '''
+        Authorization header of a signin response, none before signins returned tokens
+        Input: signin (dict)
+        Output: headers (dict)
+    '''
+    return { 'Authorization' : f'Bearer {signin["token"]}' } if signin.get( 'token' ) else {}
+
+def signup_user( session, url ):
+    '''
+        Sign up and sign in a new user
+        Input: session (requests.Session), url (str)
+        Output: userID (str), headers (dict)
+    '''
+    email = f'bench-{uuid.uuid4().hex[:12]}@example.com'
+    response = session.post( f'{url}/signup', json = { 'email' : email, 'password' : 'bench', 'firstName' : 'Bench', 'lastName' : 'User' } )
+    response.raise_for_status()
+    response = session.post( f'{url}/signin', json = { 'email' : email, 'password' : 'bench' } )
+    response.raise_for_status()
+    user = response.json()
+    return user['userID'], auth_headers( user )
+
+def seed_event( session, url, rowNo, columnNo, pricePerSeat = 100 ):
+    '''
+        Create and publish an on-sale event with one seated ticket class 'A'
+        Input: session (requests.Session), url (str), rowNo (int), columnNo (int), pricePerSeat (int)
+        Output: eventID (str)
+    '''
+    email = f'bench-eo-{uuid.uuid4().hex[:12]}@example.com'
+    response = session.post( f'{url}/eo_signup', json = { 'email' : email, 'password' : 'bench', 'organizerName' : 'Bench', 'organizerPhone' : '0' } )
+    response.raise_for_status()
+    response = session.post( f'{url}/eo_signin', json = { 'email' : email, 'password' : 'bench' } )
+    response.raise_for_status()
+    eo = response.json()
+    organizerID = eo['organizerID']
+    headers = auth_headers( eo )
+
+    now = datetime.datetime.now()
+    at = lambda days: ( now + datetime.timedelta( days = days ) ).isoformat()
+
+    response = session.post( f'{url}/eo_create_event/{organizerID}', headers = headers )
+    response.raise_for_status()
+    eventID = response.json()
+
+    for path, body in [
+        ( f'eo_event_setting/{organizerID}/{eventID}', {
+            'eventName' : 'Benchmark', 'tagName' : [ 'bench' ], 'startDateTime' : at( 2 ), 'endDateTime' : at( 3 ),
+            'onSaleDateTime' : at( -1 ), 'endSaleDateTime' : at( 1 ), 'info' : 'Benchmark', 'location' : 'Benchmark',
+            'posterImage' : 'bench.png', 'ticketType' : 'seated', 'seatImage' : 'bench.png',
+        } ),
+        ( f'eo_create_ticket_type/{organizerID}/{eventID}', {
+            'className' : 'A', 'amountOfSeat' : rowNo * columnNo, 'pricePerSeat' : pricePerSeat, 'rowNo' : rowNo, 'columnNo' : columnNo,
+            'validDatetime' : at( -1 ), 'expiredDatetime' : at( 3 ), 'zoneSeatImage' : 'bench.png',
+        } ),
+        ( f'eo_publish_event/{organizerID}/{eventID}', None ),
+    ]:
+        response = session.post( f'{url}/{path}', json = body, headers = headers )
+        response.raise_for_status()
+
+    return eventID
+
+def summarize( latencies ):
+    '''
+        Summarize latencies in seconds as milliseconds
+        Input: latencies (list)
+        Output: summary (dict)
+    '''
+    latencies = sorted( latencies )
+    return {
+        'count' : len( latencies ),
+        'p50' : round( statistics.median( latencies ) * 1000, 2 ),
+        'p95' : round( latencies[min( len( latencies ) - 1, int( len( latencies ) * 0.95 ) )] * 1000, 2 ),
+        'max' : round( latencies[-1] * 1000, 2 ),
+    }
@@ -0,0 +1,72 @@
+'''
+    Requests per second of the read endpoints under concurrent load
+    Start the server against a local mongod, run once per commit to compare:
+        mongoURI=mongodb://localhost:27017 useTransactions=false uvicorn main:app --workers 1
+        python bench/load.py --url http://localhost:8000 --concurrency 64 --seconds 10
+    Only endpoints that exist since the baseline are loaded, commits before mongoURI need
+    their hard-coded MongoClient pointed at the local mongod
+'''
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import itertools
+import threading
+import time
+
+import requests
+
+from common import seed_event, summarize
+
+def worker( url, paths, deadline, results, lock ):
+    '''
+        Send requests for paths in turn until deadline, one connection per worker
+        Input: url (str), paths (list), deadline (float), results (dict), lock (threading.Lock)
+        Output: None
+    '''
+    session = requests.Session()
+    latencies, errors = [], 0
+    for path in itertools.cycle( paths ):
+        startTime = time.perf_counter()
+        if startTime >= deadline:
+            break
+        try:
+            response = session.get( f'{url}{path}' )
+            if response.status_code >= 400:
+                errors += 1
+        except requests.RequestException:
+            errors += 1
+        latencies.append( time.perf_counter() - startTime )
+
+    with lock:
+        results['latencies'].extend( latencies )
+        results['errors'] += errors
+
+def main():
+    parser = argparse.ArgumentParser( description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( '--url', default = 'http://localhost:8000' )
+    parser.add_argument( '--concurrency', type = int, default = 64 )
+    parser.add_argument( '--seconds', type = float, default = 10 )
+    args = parser.parse_args()
+
+    session = requests.Session()
+    eventID = seed_event( session, args.url, 10, 50 )
+    paths = [ '/event', f'/event/{eventID}' ]
+
+    #   Warm up connections and caches
+    for path in paths:
+        session.get( f'{args.url}{path}' ).raise_for_status()
+
+    results = { 'latencies' : [], 'errors' : 0 }
+    lock = threading.Lock()
+    startTime = time.perf_counter()
+    deadline = startTime + args.seconds
+    with ThreadPoolExecutor( max_workers = args.concurrency ) as executor:
+        for _ in range( args.concurrency ):
+            executor.submit( worker, args.url, paths, deadline, results, lock )
+    elapsed = time.perf_counter() - startTime
+
+    print( f'concurrency {args.concurrency}, {elapsed:.1f}s' )
+    print( f'requests/sec {len( results["latencies"] ) / elapsed:.1f}, errors {results["errors"]}' )
+    print( 'latency ms', summarize( results['latencies'] ) )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+'''
+    Latency of /post_ticket against order size, each order reserves its seats first
+    Start the server against a local mongod, useTransactions=true needs a replica set:
+        mongoURI=mongodb://localhost:27017 useTransactions=false uvicorn main:app --workers 1
+        python bench/order_latency.py --url http://localhost:8000 --sizes 1 2 5 10 20 --orders 50
+'''
+import argparse
+import time
+
+import requests
+
+from common import seed_event, signup_user, summarize
+
+def main():
+    parser = argparse.ArgumentParser( description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( '--url', default = 'http://localhost:8000' )
+    parser.add_argument( '--sizes', type = int, nargs = '+', default = [ 1, 2, 5, 10, 20 ] )
+    parser.add_argument( '--orders', type = int, default = 50 )
+    args = parser.parse_args()
+
+    session = requests.Session()
+    userID, headers = signup_user( session, args.url )
+
+    #   One row per order, so every order gets fresh seats
+    columnNo = max( args.sizes )
+    eventID = seed_event( session, args.url, len( args.sizes ) * args.orders, columnNo )
+
+    print( 'seats  p50 ms  p95 ms  max ms' )
+    row = 0
+    for size in args.sizes:
+        latencies = []
+        for _ in range( args.orders ):
+            row += 1
+            order = { 'eventID' : eventID, 'userID' : userID, 'className' : 'A', 'seatNo' : [ f'{row}-{column}' for column in range( 1, size + 1 ) ] }
+            session.post( f'{args.url}/reserve_ticket', json = order, headers = headers ).raise_for_status()
+
+            startTime = time.perf_counter()
+            response = session.post( f'{args.url}/post_ticket', json = order, headers = headers )
+            latencies.append( time.perf_counter() - startTime )
+            response.raise_for_status()
+
+        summary = summarize( latencies )
+        print( f'{size:5}  {summary["p50"]:6}  {summary["p95"]:6}  {summary["max"]:6}' )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+'''
+    Sign-ins per second of concurrent /signin storms, and latency of GET /event meanwhile
+    Legacy sha512 users are inserted straight into the database, each signs in once since
+    its first signin rehashes it, scrypt users sign up through the API:
+        mongoURI=mongodb://localhost:27017 useTransactions=false uvicorn main:app --workers 1
+        python bench/signin.py --url http://localhost:8000 --mongo-uri mongodb://localhost:27017 --signins 200 --concurrency 32
+    A flat probe latency during the storm shows hashing is kept off the event loop
+'''
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import hashlib
+import threading
+import time
+import uuid
+
+import pymongo
+import requests
+
+from common import summarize
+
+def legacy_users( database, count ):
+    '''
+        Insert users with the sha512 password hash of before scrypt
+        Input: database (pymongo.database.Database), count (int)
+        Output: emails (list)
+    '''
+    users = []
+    for _ in range( count ):
+        salt = uuid.uuid4().hex
+        users.append( {
+            'userID' : f'bench-{uuid.uuid4().hex}',
+            'email' : f'bench-legacy-{uuid.uuid4().hex[:12]}@example.com',
+            'firstName' : 'Bench',
+            'lastName' : 'User',
+            'password_hash' : hashlib.sha512( ( 'bench' + salt ).encode( 'utf-8' ) ).hexdigest(),
+            'salt' : salt,
+            'event' : [],
+            'telephoneNumber' : '',
+        } )
+    database['User'].insert_many( users )
+    return [ user['email'] for user in users ]
+
+def scrypt_users( session, url, count ):
+    '''
+        Sign up users through the API, hashed with the server's passwordHasher
+        Input: session (requests.Session), url (str), count (int)
+        Output: emails (list)
+    '''
+    emails = []
+    for _ in range( count ):
+        email = f'bench-{uuid.uuid4().hex[:12]}@example.com'
+        response = session.post( f'{url}/signup', json = { 'email' : email, 'password' : 'bench', 'firstName' : 'Bench', 'lastName' : 'User' } )
+        response.raise_for_status()
+        emails.append( email )
+    return emails
+
+def signin( url, email, local ):
+    '''
+        Sign in once, one connection per thread
+        Input: url (str), email (str), local (threading.local)
+        Output: latency (float), ok (bool)
+    '''
+    if not hasattr( local, 'session' ):
+        local.session = requests.Session()
+    startTime = time.perf_counter()
+    try:
+        ok = local.session.post( f'{url}/signin', json = { 'email' : email, 'password' : 'bench' } ).status_code == 200
+    except requests.RequestException:
+        ok = False
+    return time.perf_counter() - startTime, ok
+
+def probe( url, stop, latencies ):
+    '''
+        GET /event back to back until stop is set, at least once
+        Input: url (str), stop (threading.Event), latencies (list)
+        Output: None
+    '''
+    session = requests.Session()
+    while True:
+        startTime = time.perf_counter()
+        session.get( f'{url}/event' )
+        latencies.append( time.perf_counter() - startTime )
+        if stop.is_set():
+            break
+
+def storm( url, emails, concurrency ):
+    '''
+        Sign in every email concurrently while probing GET /event
+        Input: url (str), emails (list), concurrency (int)
+        Output: signinsPerSecond (float), errors (int), signinLatencies (list), probeLatencies (list)
+    '''
+    local = threading.local()
+    stop = threading.Event()
+    probeLatencies = []
+    prober = threading.Thread( target = probe, args = ( url, stop, probeLatencies ) )
+    prober.start()
+
+    startTime = time.perf_counter()
+    with ThreadPoolExecutor( max_workers = concurrency ) as executor:
+        results = list( executor.map( lambda email: signin( url, email, local ), emails ) )
+    elapsed = time.perf_counter() - startTime
+
+    stop.set()
+    prober.join()
+    return len( emails ) / elapsed, sum( not ok for _, ok in results ), [ latency for latency, _ in results ], probeLatencies
+
+def main():
+    parser = argparse.ArgumentParser( description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( '--url', default = 'http://localhost:8000' )
+    parser.add_argument( '--mongo-uri', default = 'mongodb://localhost:27017' )
+    parser.add_argument( '--database', default = 'EventBud' )
+    parser.add_argument( '--signins', type = int, default = 200 )
+    parser.add_argument( '--concurrency', type = int, default = 32 )
+    args = parser.parse_args()
+
+    session = requests.Session()
+    database = pymongo.MongoClient( args.mongo_uri )[args.database]
+
+    #   Probe latency with nothing else running, to compare against
+    idleLatencies = []
+    for _ in range( 50 ):
+        startTime = time.perf_counter()
+        session.get( f'{args.url}/event' ).raise_for_status()
+        idleLatencies.append( time.perf_counter() - startTime )
+    print( 'idle GET /event ms', summarize( idleLatencies ) )
+
+    for name, emails in [
+        ( 'legacy', legacy_users( database, args.signins ) ),
+        ( 'scrypt', scrypt_users( session, args.url, args.signins ) ),
+    ]:
+        signinsPerSecond, errors, signinLatencies, probeLatencies = storm( args.url, emails, args.concurrency )
+        print( f'{name}: signins/sec {signinsPerSecond:.1f}, errors {errors}' )
+        print( '    signin ms', summarize( signinLatencies ) )
+        print( '    GET /event ms', summarize( probeLatencies ) )
+
+if __name__ == '__main__':
+    main()
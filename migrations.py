@@ -0,0 +1,178 @@
+'''
+    One-off data migrations
+    Usage: python migrations.py <migration>
+'''
+from pymongo import ReplaceOne, UpdateOne
+from bson.int64 import Int64
+import asyncio
+import sys
+
+from main import client, db, new_seat_map, SEAT_WORD_BITS
+
+async def migrate_seat_maps( batchSize = 100 ):
+    '''
+        Move seatNo dicts embedded in Events ticketClass into SeatMap
+        Only sold ('available') seats are kept, old 'reserved' seats have no owner or expiry for a SeatHold so they become vacant
+        Input: batchSize (int)
+        Output: migrated (int)
+    '''
+
+    #   Connect to MongoDB
+    event_collection = db['Events']
+    seat_collection = db['SeatMap']
+
+    migrated = 0
+    seatOperations = []
+    eventOperations = []
+    cursor = event_collection.find( { 'ticketClass.seatNo' : { '$exists' : True } }, { '_id' : 0, 'eventID' : 1, 'ticketClass' : 1 } ).batch_size( batchSize )
+    async for event in cursor:
+        for ticketClass in event['ticketClass']:
+            if 'seatNo' not in ticketClass:
+                continue
+
+            #   Set bits of sold seats
+            #       A reserved bit without a hold could never be released, cancelled or bought
+            seatMap = new_seat_map( event['eventID'], ticketClass['className'], ticketClass['rowNo'], ticketClass['columnNo'] )
+            for seatNo, status in ticketClass['seatNo'].items():
+                if status != 'available':
+                    continue
+                row, column = [ int( number ) for number in seatNo.split( '-' ) ]
+                word, bit = ( column - 1 ) // SEAT_WORD_BITS, ( column - 1 ) % SEAT_WORD_BITS
+                value = seatMap['sold'][row - 1][word] | 1 << bit
+                seatMap['sold'][row - 1][word] = Int64( value - ( 1 << 64 ) if value >= 1 << 63 else value )
+
+            seatOperations.append( ReplaceOne( { 'eventID' : event['eventID'], 'className' : ticketClass['className'] }, seatMap, upsert = True ) )
+
+        eventOperations.append( UpdateOne( { 'eventID' : event['eventID'] }, { '$unset' : { 'ticketClass.$[].seatNo' : '' } } ) )
+
+        #   Write one batch at a time, seat maps before the embedded copy is dropped
+        if len( eventOperations ) >= batchSize:
+            if seatOperations:
+                await seat_collection.bulk_write( seatOperations, ordered = False )
+            await event_collection.bulk_write( eventOperations, ordered = False )
+            migrated += len( eventOperations )
+            seatOperations, eventOperations = [], []
+
+    if seatOperations:
+        await seat_collection.bulk_write( seatOperations, ordered = False )
+    if eventOperations:
+        await event_collection.bulk_write( eventOperations, ordered = False )
+        migrated += len( eventOperations )
+
+    return migrated
+
+async def migrate_organizer_ids( batchSize = 100 ):
+    '''
+        Set organizerID on Events from the organizer with the same organizerEmail
+        Input: batchSize (int)
+        Output: migrated (int)
+    '''
+
+    #   Connect to MongoDB
+    eo_collection = db['EventOrganizer']
+    event_collection = db['Events']
+
+    migrated = 0
+    while True:
+        events = await event_collection.find(
+            { 'organizerID' : { '$exists' : False }, 'organizerEmail' : { '$exists' : True } },
+            { '_id' : 0, 'eventID' : 1, 'organizerEmail' : 1 }
+        ).to_list( length = batchSize )
+        if not events:
+            break
+
+        #   Get organizers of this batch in one query
+        emails = list( { event['organizerEmail'] for event in events } )
+        organizerIDs = {}
+        async for eo in eo_collection.find( { 'email' : { '$in' : emails } }, { '_id' : 0, 'email' : 1, 'organizerID' : 1 } ):
+            organizerIDs[eo['email']] = eo['organizerID']
+
+        #   Events without an organizer are marked with None so the next batch moves on
+        eventOperations = [ UpdateOne(
+            { 'eventID' : event['eventID'] },
+            { '$set' : { 'organizerID' : organizerIDs.get( event['organizerEmail'] ) } }
+        ) for event in events ]
+        await event_collection.bulk_write( eventOperations, ordered = False )
+        migrated += sum( event['organizerEmail'] in organizerIDs for event in events )
+
+        for event in events:
+            if event['organizerEmail'] not in organizerIDs:
+                print( f'{event["eventID"]}: no organizer with email {event["organizerEmail"]}' )
+
+    return migrated
+
+async def migrate_sales_rollups( batchSize = 100 ):
+    '''
+        Rebuild SalesRollup from created and scanned TicketTransaction, revenue at the current zone price
+        Input: batchSize (int)
+        Output: migrated (int)
+    '''
+
+    #   Connect to MongoDB
+    event_collection = db['Events']
+    ledger_collection = db['TicketTransaction']
+    rollup_collection = db['SalesRollup']
+
+    #   Older transactions have no eventID, so the ticket gives eventID and className
+    pipeline = [
+        { '$match' : { 'transactionType' : { '$in' : [ 'created', 'scanned' ] } } },
+        { '$lookup' : { 'from' : 'Ticket', 'localField' : 'ticketID', 'foreignField' : 'ticketID', 'as' : 'ticket' } },
+        { '$unwind' : '$ticket' },
+        { '$group' : {
+            '_id' : {
+                'eventID' : '$ticket.eventID',
+                'className' : '$ticket.className',
+                'hour' : { '$dateFromParts' : {
+                    'year' : { '$year' : '$timestamp' },
+                    'month' : { '$month' : '$timestamp' },
+                    'day' : { '$dayOfMonth' : '$timestamp' },
+                    'hour' : { '$hour' : '$timestamp' },
+                } },
+            },
+            'sold' : { '$sum' : { '$cond' : [ { '$eq' : [ '$transactionType', 'created' ] }, 1, 0 ] } },
+            'scanned' : { '$sum' : { '$cond' : [ { '$eq' : [ '$transactionType', 'scanned' ] }, 1, 0 ] } },
+        } },
+    ]
+
+    migrated = 0
+    prices = {}
+    rollupOperations = []
+    async for bucket in ledger_collection.aggregate( pipeline, allowDiskUse = True ):
+        eventID = bucket['_id']['eventID']
+        if eventID not in prices:
+            event = await event_collection.find_one( { 'eventID' : eventID }, { '_id' : 0, 'zoneRevenue' : 1 } )
+            prices[eventID] = { zone['className'] : zone['price'] for zone in event['zoneRevenue'] } if event else {}
+
+        rollupOperations.append( UpdateOne( bucket['_id'], { '$set' : {
+            'sold' : bucket['sold'],
+            'revenue' : bucket['sold'] * prices[eventID].get( bucket['_id']['className'], 0 ),
+            'scanned' : bucket['scanned'],
+        } }, upsert = True ) )
+
+        if len( rollupOperations ) >= batchSize:
+            await rollup_collection.bulk_write( rollupOperations, ordered = False )
+            migrated += len( rollupOperations )
+            rollupOperations = []
+
+    if rollupOperations:
+        await rollup_collection.bulk_write( rollupOperations, ordered = False )
+        migrated += len( rollupOperations )
+
+    return migrated
+
+MIGRATIONS = {
+    'seat_maps' : migrate_seat_maps,
+    'organizer_ids' : migrate_organizer_ids,
+    'sales_rollups' : migrate_sales_rollups,
+}
+
+async def main( name ):
+    migrated = await MIGRATIONS[name]()
+    print( f'{name}: migrated {migrated} documents' )
+    client.close()
+
+if __name__ == '__main__':
+    if len( sys.argv ) != 2 or sys.argv[1] not in MIGRATIONS:
+        print( f'Usage: python migrations.py [{"|".join( MIGRATIONS )}]' )
+        sys.exit( 1 )
+    asyncio.run( main( sys.argv[1] ) )
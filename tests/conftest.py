@@ -0,0 +1,55 @@
+'''
+    Shared test setup
+    Tests that need MongoDB run against testMongoURI, a local mongod by default, and are skipped without one
+'''
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+import asyncio
+import os
+import sys
+import uuid
+
+import pytest
+
+#   Configure main before it is imported, a standalone mongod has no transactions
+TEST_MONGO_URI = os.getenv( 'testMongoURI', 'mongodb://localhost:27017' )
+os.environ.setdefault( 'mongoURI', TEST_MONGO_URI )
+os.environ.setdefault( 'useTransactions', 'false' )
+sys.path.insert( 0, os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+
+import main
+
+def run_with_db( scenario ):
+    '''
+        Run scenario( db ) on a fresh database, with main using it, dropped afterwards
+        Input: scenario (coroutine function)
+        Output: result of scenario
+    '''
+    async def run():
+        #   One client per event loop, motor clients stay on the loop that first used them
+        client = AsyncIOMotorClient( TEST_MONGO_URI, serverSelectionTimeoutMS = 1000 )
+        try:
+            await client.admin.command( 'ping' )
+        except PyMongoError:
+            client.close()
+            pytest.skip( f'No mongod at {TEST_MONGO_URI}' )
+
+        database = client[f'EventBudTest{uuid.uuid4().hex[:8]}']
+        mainDatabase = main.db
+        main.db = database
+        for cache in main.CACHES.values():
+            cache.clear()
+        try:
+            return await scenario( database )
+        finally:
+            main.db = mainDatabase
+            for cache in main.CACHES.values():
+                cache.clear()
+            await client.drop_database( database.name )
+            client.close()
+
+    return asyncio.run( run() )
+
+@pytest.fixture
+def mongo():
+    return run_with_db
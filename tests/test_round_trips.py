@@ -0,0 +1,104 @@
+'''
+    Database round trips per request of the staff endpoints
+'''
+import datetime
+
+import main
+
+#   Collection methods that each cost one round trip, a find counts when it is made
+ROUND_TRIP_METHODS = {
+    'find', 'find_one', 'aggregate', 'count_documents', 'bulk_write',
+    'insert_one', 'insert_many', 'update_one', 'update_many', 'delete_one', 'delete_many',
+    'find_one_and_update',
+}
+
+class CountingCollection:
+    '''
+        Collection that records ( collection, method ) of every round trip
+    '''
+    def __init__( self, collection, calls ):
+        self.collection = collection
+        self.calls = calls
+
+    def __getattr__( self, name ):
+        attribute = getattr( self.collection, name )
+        if name not in ROUND_TRIP_METHODS:
+            return attribute
+
+        def counted( *args, **kwargs ):
+            self.calls.append( ( self.collection.name, name ) )
+            return attribute( *args, **kwargs )
+        return counted
+
+class CountingDatabase:
+    '''
+        Database whose collections record their round trips in calls
+    '''
+    def __init__( self, database ):
+        self.database = database
+        self.calls = []
+
+    def __getitem__( self, name ):
+        return CountingCollection( self.database[name], self.calls )
+
+    def __getattr__( self, name ):
+        return getattr( self.database, name )
+
+def test_get_all_staff_round_trips( mongo ):
+    staffIDs = [ f'staff{i}' for i in range( 300 ) ]
+
+    async def scenario( db ):
+        await db['EventOrganizer'].insert_one( { 'organizerID' : 'org', 'email' : 'org@example.com' } )
+        await db['Events'].insert_one( { 'eventID' : 'EV1', 'organizerID' : 'org', 'staff' : staffIDs[::-1] } )
+        await db['User'].insert_many( [ { 'userID' : staffID, 'password_hash' : 'x', 'salt' : 'y' } for staffID in staffIDs ] )
+
+        main.db = CountingDatabase( db )
+        staffs = await main.get_all_staff( 'org', 'EV1', claims = None )
+
+        #   Organizer, event and one $in query for every staff
+        assert sorted( main.db.calls ) == [ ( 'EventOrganizer', 'find_one' ), ( 'Events', 'find_one' ), ( 'User', 'find' ) ]
+        assert [ staff['userID'] for staff in staffs ] == staffIDs[::-1]
+        assert not any( 'password_hash' in staff or 'salt' in staff for staff in staffs )
+
+        #   Organizer and event come from cache the second time
+        main.db.calls.clear()
+        await main.get_all_staff( 'org', 'EV1', claims = None )
+        assert main.db.calls == [ ( 'User', 'find' ) ]
+
+    mongo( scenario )
+
+def test_get_staff_event_round_trips( mongo ):
+    now = datetime.datetime.now()
+    ongoingIDs = [ f'EV{i}' for i in range( 200 ) ]
+    expiredIDs = [ f'EX{i}' for i in range( 50 ) ]
+    deletedIDs = [ f'DE{i}' for i in range( 50 ) ]
+
+    async def scenario( db ):
+        await db['Events'].insert_many( [ {
+            'eventID' : eventID,
+            'eventStatus' : 'On-going',
+            'startDateTime' : now + datetime.timedelta( hours = i ),
+            'endDateTime' : now + datetime.timedelta( days = 1 ),
+        } for i, eventID in enumerate( ongoingIDs[::-1] ) ] + [ {
+            'eventID' : eventID,
+            'eventStatus' : 'On-going',
+            'startDateTime' : now - datetime.timedelta( days = 2 ),
+            'endDateTime' : now - datetime.timedelta( days = 1 ),
+        } for eventID in expiredIDs ] )
+        await db['User'].insert_one( { 'userID' : 'staff', 'event' : expiredIDs + ongoingIDs + deletedIDs } )
+
+        main.db = CountingDatabase( db )
+        events = await main.get_staff_event( 'staff', claims = None )
+
+        #   User, one $in query for every event and one $pullAll for expired and deleted events
+        assert main.db.calls == [ ( 'User', 'find_one' ), ( 'Events', 'find' ), ( 'User', 'update_one' ) ]
+        assert [ event['eventID'] for event in events ] == ongoingIDs[::-1]
+        user = await db['User'].find_one( { 'userID' : 'staff' } )
+        assert user['event'] == ongoingIDs
+
+        #   Nothing left to remove the second time
+        main.db.calls.clear()
+        await main.get_staff_event( 'staff', claims = None )
+        assert main.db.calls == [ ( 'User', 'find_one' ), ( 'Events', 'find' ) ]
+
+    mongo( scenario )
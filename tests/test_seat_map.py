@@ -0,0 +1,103 @@
+'''
+    Seat map bitmaps and the seat reservation engine
+'''
+from fastapi import HTTPException
+from bson.int64 import Int64
+import asyncio
+import random
+
+import pytest
+
+import main
+
+def test_parse_seats_groups_seats_by_word():
+    words, maxRow, maxColumn = main.parse_seats( [ '1-1', '1-64', '1-65', '2-3' ] )
+
+    assert words == { ( 0, 0 ) : [ 0, 63 ], ( 0, 1 ) : [ 0 ], ( 1, 0 ) : [ 2 ] }
+    assert ( maxRow, maxColumn ) == ( 2, 65 )
+
+def test_parse_seats_rejects_malformed_seats():
+    with pytest.raises( HTTPException ) as error:
+        main.parse_seats( [ '1-1', '0-1', '1-0', 'x', '1', '1-2-3' ] )
+
+    assert error.value.status_code == 400
+    assert error.value.detail == '0-1, 1-0, x, 1, 1-2-3 Seat not found'
+
+@pytest.mark.parametrize( 'bits, value', [
+    ( [], 0 ),
+    ( [ 0 ], 1 ),
+    ( [ 0, 5 ], 0b100001 ),
+    ( [ 62 ], 1 << 62 ),
+    ( [ 63 ], -( 1 << 63 ) ),
+    ( [ 0, 63 ], -( 1 << 63 ) + 1 ),
+    ( list( range( 64 ) ), -1 ),
+] )
+def test_word_mask_is_signed_64_bit( bits, value ):
+    mask = main.word_mask( bits )
+
+    assert isinstance( mask, Int64 )
+    assert mask == value
+    assert [ bit for bit in range( 64 ) if mask >> bit & 1 ] == sorted( bits )
+
+def test_inverted_word_mask_clears_only_its_bits():
+    word = main.word_mask( [ 1, 40, 63 ] )
+    cleared = word & Int64( ~main.word_mask( [ 40, 63 ] ) )
+
+    assert cleared == 0b10
+
+def test_decode_seat_map():
+    seatMap = main.new_seat_map( 'EV1', 'A', 2, 70 )
+    seatMap['sold'][0][1] = main.word_mask( [ 5 ] )
+    seatMap['reserved'][1][0] = main.word_mask( [ 0, 63 ] )
+
+    seatNo = main.decode_seat_map( seatMap )
+
+    assert len( seatNo ) == 140
+    assert { seat : status for seat, status in seatNo.items() if status != 'vacant' } == {
+        '1-70' : 'available',
+        '2-1' : 'reserved',
+        '2-64' : 'reserved',
+    }
+
+def test_concurrent_claims_never_double_book( mongo ):
+    '''
+        Many buyers claim overlapping seats at once, around the sign bit and a word boundary
+    '''
+    eventID, className = 'EV1', 'A'
+    seats = [ f'{row}-{column}' for row in ( 1, 2 ) for column in range( 58, 71 ) ]
+    randomizer = random.Random( 2023 )
+    orders = [ randomizer.sample( seats, randomizer.randint( 1, 4 ) ) for _ in range( 200 ) ]
+
+    async def scenario( db ):
+        await db['Events'].insert_one( { 'eventID' : eventID } )
+        await db['SeatMap'].insert_one( main.new_seat_map( eventID, className, 2, 70 ) )
+
+        #   Reserve
+        conflicts = await asyncio.gather( *[ main.claim_seats( eventID, className, order, 'vacant', 'reserved' ) for order in orders ] )
+        reservedOrders = [ order for order, conflictSeats in zip( orders, conflicts ) if not conflictSeats ]
+        reservedSeats = [ seat for order in reservedOrders for seat in order ]
+
+        assert reservedOrders
+        assert len( reservedSeats ) == len( set( reservedSeats ) )
+        for order, conflictSeats in zip( orders, conflicts ):
+            assert set( conflictSeats ) <= set( order ) & set( reservedSeats )
+
+        seatMap = await db['SeatMap'].find_one( { 'eventID' : eventID, 'className' : className } )
+        seatNo = main.decode_seat_map( seatMap )
+        assert { seat for seat, status in seatNo.items() if status == 'reserved' } == set( reservedSeats )
+
+        #   Every reserved order is sold once, even if paid twice at the same time
+        conflicts = await asyncio.gather( *[ main.claim_seats( eventID, className, order, 'reserved', 'available' ) for order in reservedOrders * 2 ] )
+        assert sum( not conflictSeats for conflictSeats in conflicts ) == len( reservedOrders )
+
+        seatMap = await db['SeatMap'].find_one( { 'eventID' : eventID, 'className' : className } )
+        seatNo = main.decode_seat_map( seatMap )
+        assert { seat for seat, status in seatNo.items() if status != 'vacant' } == set( reservedSeats )
+        assert all( seatNo[seat] == 'available' for seat in reservedSeats )
+
+        #   Sold seats can be neither reserved nor released again
+        for order in reservedOrders:
+            assert await main.claim_seats( eventID, className, order, 'vacant', 'reserved' ) == order
+            assert await main.claim_seats( eventID, className, order, 'reserved', 'vacant' ) == order
+
+    mongo( scenario )